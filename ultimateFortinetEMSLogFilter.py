@@ -1,12 +1,28 @@
 import os
 import re
+import sys
 import json
+import locale
+import mmap
+import multiprocessing
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+from array import array
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from datetime import datetime
 import subprocess
-from copy import deepcopy
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; without it each filter term is checked with 'in'
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; without it the json module reads the checkbox states
+    orjson = None
 
 #
 # -----------------------------------------------------------------------
@@ -28,6 +44,9 @@ from copy import deepcopy
 # 1. Load a log file to parse key-value pairs from each log entry.
 # 2. Display checkboxes for each unique key found in the log file, to select which keys to include in the output.
 # 3. Filter Text - Filter by or filter out text. Only entries containing or not containing this text.
+#    Separate several terms with | to match entries containing any of them; write \| for a literal pipe.
+#    Filter Field - Pick a key (e.g. srcname) to only match entries whose value for it equals the filter text,
+#    ignoring case, surrounding spaces and quotes. With (any), the filter text matches anywhere in the entry.
 # 4. Lines Before/After - Specify a number of contextual lines to include around each matching entry in the output.
 # 5. Save filtered results to a new file with a timestamp in the filename.
 # 6. Automatically opens the saved file in Notepad++ for quick viewing and further editing. 
@@ -38,13 +57,53 @@ from copy import deepcopy
 # - Start the tool and use the "Load Log File" button to load the desired log file.
 # - Select or deselect keys to include in the output by checking the corresponding boxes.
 # - If needed, enter a filter text and specify whether to include or exclude entries with this text.
+#   Choose a Filter Field to match the text against that key's value only.
 # - Specify the number of lines before and after matching entries to include for additional context.
 # - Click "Save Selected" to save the filtered entries to a new file and automatically open this file in Notepad++.
 # - This will also save the current checkboxes selected/not selected to config.txt for favorite keys
+# - The loaded log stays memory-mapped until another file is loaded. On Windows this locks it, so it cannot
+#   be truncated or replaced meanwhile. If the file changes anyway, "Save & View" asks you to load it again.
+
+# Regular expression pattern for key-value pairs, compiled once for every line of every log.
+# FortiClient keys are always space-delimited, so a leading space replaces the slower \b word-boundary check.
+KV_PATTERN = re.compile(rb' (\w+)=(\"[^\"]*\"|\S+)')
+
+# Find the key-value pairs of one line straight from the mapping, e.g. for the rows being saved
+def find_pairs(log_map, kv_start, kv_end):
+    """ Return {key: value} bytes for the pairs in log_map[kv_start:kv_end].
+        A repeated key keeps its last value but stays where it first appeared, like a dict would. """
+    if log_map[kv_start - 1:kv_start] == b' ':
+        return dict(KV_PATTERN.findall(log_map, kv_start - 1, kv_end))  # The space before 'date=' lets the first key match
+    return dict(KV_PATTERN.findall(b' ' + log_map[kv_start:kv_end]))
+
+# Encoding the log was read with before it was parsed as bytes; used to lower-case non-ASCII text
+LOG_ENCODING = locale.getpreferredencoding(False)
+
+# bytes.lower() only lower-cases ASCII, so text with other characters is lower-cased as str instead
+def fold_case(value):
+    """ Return the bytes value lower-cased, including its non-ASCII letters. """
+    if value.isascii():
+        return value.lower()
+    return value.decode(LOG_ENCODING, 'replace').lower().encode(LOG_ENCODING, 'replace')
+
+# Key names repeat on every line, so each distinct name is decoded and interned only once
+key_cache = {}
+
+# Keys that get a value -> rows index while parsing, so filtering on them is a lookup rather than a scan
+INDEXED_KEYS = {'srcname', 'dstip', 'url', 'user'}
+# Filter field entry that matches the filter text anywhere in the line
+ANY_FIELD = "(any)"
+
+# Parsed data of the loaded log file
+all_data = None
 
 # Initialize a variable to keep track of the last saved state
 last_saved_state = None
 
+# Cached contents of checkbox_states.txt, reloaded only when the file's modification time changes
+states_cache = None
+states_mtime = None
+
 # Function to compare current checkbox state with the last saved state
 def has_state_changed(current_state, last_state):
     if last_state is None:
@@ -53,46 +112,234 @@ def has_state_changed(current_state, last_state):
 
 # Load the last three checkbox states from a file
 def load_checkbox_states():
+    global states_cache, states_mtime
     try:
-        with open('checkbox_states.txt', 'r') as f:
-            return json.load(f)  # Load the JSON array from file
+        mtime = os.stat('checkbox_states.txt').st_mtime_ns
     except FileNotFoundError:
+        states_cache = states_mtime = None
         return []
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return []
+    if states_cache is None or mtime != states_mtime:
+        try:
+            with open('checkbox_states.txt', 'rb') as f:
+                if orjson is not None:
+                    states_cache = orjson.loads(f.read())  # Load the JSON array from file
+                else:
+                    states_cache = json.load(f)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError as e:
+            print(f"Error decoding JSON: {e}")
+            states_cache = []
+        states_mtime = mtime
+    return list(states_cache)  # Callers may append to the list they get back
+
+# Logs smaller than this are parsed in-process; starting worker processes would cost more than it saves
+PARALLEL_MIN_SIZE = 32 * 1024 * 1024
+# ProcessPoolExecutor refuses more than 61 workers on Windows
+MAX_WORKERS = 61
+
+# Map the log file read-only so lines are paged in on demand instead of read into memory
+def map_log_file(filepath):
+    """ Return a read-only mmap of the file, or its bytes where the file cannot be mapped. """
+    with open(filepath, 'rb') as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # Empty files and some filesystems cannot be mapped
+            return file.read()
 
 # Function to parse the log file and extract key-value pairs
 def parse_log_file(filepath):
-    """ Parse the log file and extract key-value pairs from each line, preserving the prefix. """
-    data = []  # List to store parsed data
-    keys_order = OrderedDict()  # Ordered dictionary to maintain the order of keys
-    with open(filepath, 'r') as file:
-        lines = file.readlines()  # Read all lines from the log file
-
-    for index, line in enumerate(lines):
-        if 'date=' in line:
-            prefix_part, kv_part = line.split('date=', 1)  # Split into prefix and key-value pairs
-            prefix_part = prefix_part.strip()  # Strip any extra whitespace
-            kv_part = 'date=' + kv_part.strip()  # Reconstruct the key-value string
-        else:
-            prefix_part = line.strip()  # If 'date=' is not found, treat the whole line as prefix
-            kv_part = ""
+    """ Parse the log file, splitting large files into line-aligned chunks parsed in parallel. """
+    log_map = map_log_file(filepath)  # Kept open: the parsed data holds offsets into it
+    file_stat = os.stat(filepath)
+    size = len(log_map)
+    workers = min(os.cpu_count() or 1, MAX_WORKERS)
+    if size < PARALLEL_MIN_SIZE or workers == 1:
+        data, keys_order = parse_log_chunk(filepath, 0, size, log_map)
+    else:
+        # Pick one split point per worker, moved forward to the start of the next line
+        bounds = [0]
+        for i in range(1, workers):
+            split = log_map.find(b'\n', max(bounds[-1], size * i // workers))
+            if split == -1 or split + 1 >= size:
+                break
+            bounds.append(split + 1)
+        bounds.append(size)
+
+        # Each worker maps the file itself, so the chunks are shared through the page cache instead of being copied
+        with ProcessPoolExecutor(max_workers=len(bounds) - 1) as executor:
+            chunks = list(executor.map(parse_log_chunk, repeat(filepath), bounds[:-1], bounds[1:]))
+        data, keys_order = merge_log_chunks(chunks)
+    data['log_map'] = log_map
+    data['file_stat'] = (file_stat.st_size, file_stat.st_mtime_ns)  # To detect the file changing under the mapping
+    return data, keys_order
 
-        pattern = re.compile(r'\b(\w+)=(\"[^\"]*\"|\S+)')  # Regular expression pattern for key-value pairs
-        if kv_part:
-            entry = {match.group(1): match.group(2) for match in pattern.finditer(kv_part)}  # Parse key-value pairs
-        else:
-            entry = {}
+# The saved lines are sliced from the mapping, so they are only right while the file is unchanged
+def log_file_changed(all_data, filepath):
+    """ Tell whether the log file was modified, truncated or removed since it was parsed. """
+    try:
+        file_stat = os.stat(filepath)
+    except OSError:
+        return True
+    return (file_stat.st_size, file_stat.st_mtime_ns) != all_data['file_stat']
+
+# Combine the chunks parsed by the workers, shifting their row indexes into place
+def merge_log_chunks(chunks):
+    """ Merge (data, keys_order) results of consecutive chunks into one. """
+    data, keys_order = chunks[0]
+    row_count = len(data['searchable'])
+    for chunk_data, chunk_keys in chunks[1:]:
+        for offsets in ('line_starts', 'kv_starts', 'line_ends'):
+            data[offsets].extend(chunk_data[offsets])  # File offsets need no shifting
+        for key, chunk_index in chunk_data['indices'].items():
+            value_index = data['indices'].setdefault(key, {})
+            for value, rows in chunk_index.items():
+                value_index.setdefault(value, array('L')).extend(row + row_count for row in rows)
+        data['searchable'].extend(chunk_data['searchable'])
+        keys_order.update(chunk_keys)  # Union of keys, still in first encountered order
+        row_count += len(chunk_data['searchable'])
+    return data, keys_order
 
-        data.append((prefix_part, entry, index))  # Append parsed data along with the index for context
-        for key in entry.keys():
-            keys_order[key] = None  # Keep track of all unique keys in their first encountered order
+def parse_log_chunk(filepath, start, end, log_map=None):
+    """ Parse the lines in filepath[start:end] and extract key-value pairs from each line, preserving the prefix.
+        log_map is the file's existing mapping, if the caller already has one. """
+    # Row layout of file offsets: nothing is copied out of the file except the search text
+    data = {
+        'line_starts': array('Q'),  # Row i is log_map[line_starts[i]:line_ends[i]]
+        'kv_starts': array('Q'),  # Where row i's key-value pairs start, or its line end if it has none
+        'line_ends': array('Q'),
+        'searchable': [],  # Lower-cased prefix and values of each row for the filter text
+        'indices': {},  # key -> lower-cased unquoted value -> row indexes, for INDEXED_KEYS
+    }
+    keys_order = OrderedDict()  # Ordered dictionary to maintain the order of keys
+    if start >= end:
+        return data, keys_order  # Nothing to parse
+
+    if log_map is None:
+        log_map = map_log_file(filepath)
+    line_starts = data['line_starts']
+    kv_starts = data['kv_starts']
+    line_ends = data['line_ends']
+    searchables = data['searchable']
+    # Each index also gets a cache of the values as found in the file, so every distinct value is folded only once
+    index_items = [(key.encode('ascii'), data['indices'].setdefault(key, {}), {}) for key in INDEXED_KEYS]
+    known_keys = set()
+    find = log_map.find
+    findall = KV_PATTERN.findall
+    pos = start
+    index = 0
+    while pos < end:
+        line_end = find(b'\n', pos, end)  # Locate the end of the current line
+        if line_end == -1:
+            line_end = end
+        line_start = pos
+        pos = line_end + 1
+
+        kv_start = find(b'date=', line_start, line_end)
+        if kv_start == -1:
+            kv_start = line_end  # If 'date=' is not found, treat the whole line as prefix
+        raw_prefix = log_map[line_start:kv_start]
+        if raw_prefix[-1:] == b' ':
+            # One C-level pass over the line in the mapping, the same as find_pairs without its function call
+            entry = dict(findall(log_map, kv_start - 1, line_end))
+        else:
+            entry = find_pairs(log_map, kv_start, line_end)
+        if not entry.keys() <= known_keys:
+            for key in entry:
+                if key not in known_keys:
+                    known_keys.add(key)
+                    name = key_cache.get(key)
+                    if name is None:
+                        name = key_cache[key] = sys.intern(key.decode('ascii'))
+                    keys_order[name] = None  # Keep track of all unique keys in their first encountered order
+        line_starts.append(line_start)
+        kv_starts.append(kv_start)
+        line_ends.append(line_end)
+        for key, value_index, found_values in index_items:
+            value = entry.get(key)
+            if value is not None:
+                value_rows = found_values.get(value)
+                if value_rows is None:  # Spellings that fold to the same value share its rows
+                    value_rows = found_values[value] = value_index.setdefault(fold_case(value.strip(b'"')), array('L'))
+                value_rows.append(index)
+
+        # Lower-cased prefix and values for the filter text; the newline keeps matches from spanning two fields
+        searchables.append(b'\n'.join((raw_prefix.strip(), *entry.values())).lower())
+        index += 1
 
     return data, keys_order
 
-def save_results(selected_keys, all_data, original_file, filter_text, exclude_filter, context_lines):
-    """ Save the selected key-value pairs to a new file with timestamp, then open it in Notepad++. """
+# Number of formatted lines joined into each write of the results file
+WRITE_BATCH_LINES = 256
+
+# An unescaped '|' separates filter terms; '\|' stands for a literal pipe
+FILTER_TERM_SEPARATOR = re.compile(r'(?<!\\)\|')
+
+def split_filter_terms(filter_text):
+    """ Split the filter text into its non-empty terms, keeping it whole if that leaves none (e.g. a lone '|'). """
+    terms = [term.replace('\\|', '|') for term in FILTER_TERM_SEPARATOR.split(filter_text) if term]
+    return terms or ([filter_text] if filter_text else [])
+
+# Compile the filter text into a matcher; terms separated by '|' match if any of them is found
+def compile_filter(filter_text):
+    """ Return a function telling whether a lower-cased searchable blob matches the filter text. """
+    return compile_needles(list(dict.fromkeys(fold_case(term.encode(LOG_ENCODING, 'replace')) for term in split_filter_terms(filter_text))))
+
+def compile_needles(needles):
+    """ Return a function telling whether a lower-cased searchable blob contains any of the case-folded needles. """
+    if len(needles) <= 1:
+        needle = needles[0] if needles else b''
+        matches = lambda searchable: needle in searchable
+    elif ahocorasick is None:
+        matches = lambda searchable: any(needle in searchable for needle in needles)
+    else:
+        # One Aho-Corasick pass per entry finds any of the terms; latin-1 maps each byte to one character
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle.decode('latin-1'), needle)
+        automaton.make_automaton()
+        matches = lambda searchable: next(automaton.iter(searchable.decode('latin-1')), None) is not None
+
+    if all(needle.isascii() for needle in needles):
+        return matches
+    # The search text was lower-cased as bytes, so fold its non-ASCII letters too before matching
+    return lambda searchable: matches(fold_case(searchable))
+
+# Find the rows whose value for one field equals the filter text, using the index when the field has one
+def find_field_rows(all_data, key, filter_text):
+    """ Return the set of rows whose value for key equals one of the '|'-separated terms, ignoring case and quotes. """
+    # Normalised like the indexed values, so ' "host" ' finds host
+    needles = {fold_case(term.strip().strip('"').encode(LOG_ENCODING, 'replace')) for term in split_filter_terms(filter_text)}
+    value_index = all_data['indices'].get(key)
+    if value_index is not None:
+        if not needles:
+            return {row for value_rows in value_index.values() for row in value_rows}  # Every row that has the field
+        return {row for needle in needles for row in value_index.get(needle, ())}
+
+    log_map = all_data['log_map']
+    kv_starts = all_data['kv_starts']
+    line_ends = all_data['line_ends']
+    if needles:
+        # A row can only hold one of the values if its search text contains it, so the other rows are never parsed
+        contains_needle = compile_needles(list(needles))
+        candidates = [row for row, searchable in enumerate(all_data['searchable']) if contains_needle(searchable)]
+    else:
+        candidates = range(len(kv_starts))
+    key = key.encode('ascii')
+    field_rows = set()
+    for row in candidates:
+        value = find_pairs(log_map, kv_starts[row], line_ends[row]).get(key)
+        if value is not None and (not needles or fold_case(value.strip(b'"')) in needles):
+            field_rows.add(row)
+    return field_rows
+
+def save_results(selected_keys, all_data, original_file, filter_text, exclude_filter, context_lines, filter_field=None):
+    """ Save the selected key-value pairs to a new file with timestamp, then open it in Notepad++.
+        Returns False without saving if the log file changed since it was loaded. """
+    if log_file_changed(all_data, original_file):
+        messagebox.showerror("Error", "The log file has changed since it was loaded. Load it again before saving.")
+        return False
+
     timestamp = datetime.now().strftime("%H%M%S")  # Generate a timestamp for the new filename
 
     # Get the directory of the original file
@@ -104,30 +351,66 @@ def save_results(selected_keys, all_data, original_file, filter_text, exclude_fi
     # Construct the full path for the new file
     new_file_path = os.path.join(original_file_dir, new_filename)
 
-    with open(new_file_path, 'w') as file:
-        for prefix, line, idx in all_data:
-            # Check if the line matches the filter criteria
-            contains_filter = filter_text.lower() in prefix.lower() or any(filter_text.lower() in v.lower() for v in line.values())
-            if (contains_filter and not exclude_filter) or (not contains_filter and exclude_filter):
-                # Include context lines around the matched line
-                start_idx = max(0, idx - context_lines)
-                end_idx = min(len(all_data), idx + context_lines + 1)
-                for context_idx in range(start_idx, end_idx):
-                    prefix, line, _ = all_data[context_idx]
-                    # Construct a string containing the prefix and selected key-value pairs
-                    selected_data = prefix + ' ' + ' '.join(f"{k}={v}" for k, v in line.items() if k in selected_keys)
-                    file.write(selected_data + '\n')  # Write the formatted data to the file
-
-    # Open the file in Notepad++
+    log_map = all_data['log_map']
+    line_starts = all_data['line_starts']
+    kv_starts = all_data['kv_starts']
+    line_ends = all_data['line_ends']
+    selected_keys = frozenset(key.encode('ascii') for key in selected_keys)  # Compared with the key bytes in the file
+
+    def format_entry(row):
+        # Construct a string containing the prefix and selected key-value pairs; only the rows written are scanned
+        kv_start = kv_starts[row]
+        pairs = find_pairs(log_map, kv_start, line_ends[row])
+        return log_map[line_starts[row]:kv_start].strip() + b' ' + b' '.join(key + b'=' + value for key, value in pairs.items() if key in selected_keys)
+
+    # Find the rows matching the filter criteria
+    row_count = len(all_data['searchable'])
+    if filter_field:
+        field_rows = find_field_rows(all_data, filter_field, filter_text)
+        if exclude_filter:
+            matched_rows = (row for row in range(row_count) if row not in field_rows)
+        else:
+            matched_rows = sorted(field_rows)  # Only the matching rows are visited
+    else:
+        matches_filter = compile_filter(filter_text)  # Lower-case and compile the filter once rather than for every entry
+        matched_rows = (row for row, searchable in enumerate(all_data['searchable']) if matches_filter(searchable) != exclude_filter)
+
+    last_emitted = -1  # Last row written, so overlapping context is only written once
+    pending = []  # Formatted lines waiting to be written as one batch
+
+    with open(new_file_path, 'wb', buffering=1 << 20) as file:
+        for row in matched_rows:
+            # Include context lines around the matched line, skipping any already written
+            start_idx = max(last_emitted + 1, row - context_lines)
+            end_idx = min(row_count, row + context_lines + 1)
+            pending.extend(map(format_entry, range(start_idx, end_idx)))
+            last_emitted = end_idx - 1
+
+            if len(pending) >= WRITE_BATCH_LINES:
+                file.write(b'\n'.join(pending) + b'\n')  # Write the formatted data to the file
+                pending.clear()
+        if pending:
+            file.write(b'\n'.join(pending) + b'\n')
+
+    # Open the file in Notepad++ without waiting for it, so the GUI stays responsive
     try:
         notepad_plus_path = "C:\\Program Files\\Notepad++\\notepad++.exe"
-        subprocess.run([notepad_plus_path, new_file_path])  # Use subprocess to open Notepad++
+        subprocess.Popen([notepad_plus_path, new_file_path], close_fds=True)  # Use subprocess to open Notepad++
+    except FileNotFoundError as e:
+        if hasattr(os, 'startfile'):
+            try:
+                os.startfile(new_file_path)  # Notepad++ isn't installed; open the file with its default Windows program
+            except OSError as startfile_error:
+                messagebox.showerror("Error", f"Failed to open {new_file_path}: {startfile_error}")
+        else:
+            messagebox.showerror("Error", f"Failed to open Notepad++: {e}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to open Notepad++: {e}")  # Show an error if Notepad++ cannot be opened
+    return True
 
 # Save the current checkbox state and keep only the last three states
 def save_checkbox_states():
-    global last_saved_state
+    global last_saved_state, states_cache, states_mtime
     state = {key: var.get() for key, var in checkboxes.items()}
     if not has_state_changed(state, last_saved_state):
         print("No changes detected. Skipping save.")
@@ -136,8 +419,10 @@ def save_checkbox_states():
     states.append(state)
     states = states[-3:]  # Keep only the last three states
     with open('checkbox_states.txt', 'w') as f:
-        json.dump(states, f, indent=4)  # Save states as a JSON array
-    last_saved_state = deepcopy(state)
+        json.dump(states, f, separators=(',', ':'))  # Save states as a compact JSON array
+    states_cache = states  # Keep the cache in step with what was just written
+    states_mtime = os.stat('checkbox_states.txt').st_mtime_ns
+    last_saved_state = state  # The comprehension above already built a fresh dict
 
 # Function to update checkboxes based on the selected state
 def update_checkboxes(event):
@@ -153,17 +438,6 @@ def update_checkboxes(event):
 def bind_combobox():
     combobox.bind("<<ComboboxSelected>>", update_checkboxes)
 
-# Load the last three checkbox states from a file
-def load_checkbox_states():
-    try:
-        with open('checkbox_states.txt', 'r') as f:
-            return json.load(f)  # Load the JSON array from file
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return []
-
 # Update the dropdown with the last three checkbox states
 def update_combobox():
     states = load_checkbox_states()
@@ -180,28 +454,39 @@ def load_file():
     filepath = filedialog.askopenfilename()  # Open a file dialog to select a log file
     if not filepath:
         return  # Return if no file was selected
+    previous_data = all_data
     all_data, keys_order = parse_log_file(filepath)  # Parse the selected file
+    if previous_data is not None and isinstance(previous_data['log_map'], mmap.mmap):
+        previous_data['log_map'].close()  # Release the previous file's mapping
     saved_states = load_checkbox_states()  # Load previously saved checkbox states
     if saved_states:
-        last_saved_state = deepcopy(saved_states[-1])
+        last_saved_state = dict(saved_states[-1])
     else:
         last_saved_state = None
     filename_label.config(text="FileName: " + os.path.basename(filepath))  # Update the filename label
+    filter_field_combobox['values'] = [ANY_FIELD, *keys_order]  # Offer the keys of this file as filter fields
+    if filter_field_combobox.get() not in keys_order:
+        filter_field_combobox.set(ANY_FIELD)
 
-    for widget in scrollable_frame.winfo_children():
-        widget.destroy()  # Clear all previous checkbox widgets
+    # Reuse the checkbox widgets and variables from the previous file rather than recreating them
     checkboxes.clear()
     column = 0
     row = 0
-    for key in keys_order.keys():
+    for i, key in enumerate(keys_order.keys()):
         checked = False
         if saved_states:
             state = saved_states[-1]
             if isinstance(state, dict):
                 checked = state.get(key, False)
 
-        var = tk.BooleanVar(value=checked)
-        cb = tk.Checkbutton(scrollable_frame, text=key, variable=var)
+        if i < len(checkbutton_pool):
+            cb, var = checkbutton_pool[i]
+            cb.config(text=key)
+            var.set(checked)
+        else:
+            var = tk.BooleanVar(value=checked)
+            cb = tk.Checkbutton(scrollable_frame, text=key, variable=var)
+            checkbutton_pool.append((cb, var))
         cb.grid(row=row, column=column, sticky='w')  # Arrange checkboxes in a grid layout
         checkboxes[key] = var  # Add checkbox variable to the dictionary
 
@@ -211,6 +496,9 @@ def load_file():
             column = 0
             row += 1
 
+    for cb, _ in checkbutton_pool[len(keys_order):]:
+        cb.grid_forget()  # Hide the checkboxes this file doesn't need
+
 
 # Save filtered results and checkbox states
 def save_filtered_results():
@@ -219,92 +507,112 @@ def save_filtered_results():
     filter_text = filter_entry.get()  # Get the filter text
     exclude_filter = filter_out_var.get()  # Check if the 'exclude filter' option is selected
     context_lines = int(lines_context_entry.get() or 0)  # Default to 0 if empty
-    save_results(selected_keys, all_data, filepath, filter_text, exclude_filter, context_lines)  # Save results
+    filter_field = filter_field_combobox.get()  # Match the filter text against this field only
+    if filter_field == ANY_FIELD:
+        filter_field = None
+    if not save_results(selected_keys, all_data, filepath, filter_text, exclude_filter, context_lines, filter_field):  # Save results
+        return
     save_checkbox_states()  # Save checkbox states
     update_combobox()  # Update combobox after saving states
 
-# GUI Setup
-root = tk.Tk()
-root.title("Ultimate FortiClient EMS Log Filter v.4")
-root.geometry("450x650")
-
-# Frame to contain the Load button and combobox
-top_frame = tk.Frame(root)
-top_frame.pack(pady=3)
-
-# Button to load the log file
-load_button = tk.Button(top_frame, text="Load Log File", command=load_file)
-load_button.grid(row=0, column=0, padx=5)
-
-# Label to display the loaded filename
-filename_label = tk.Label(root, text="No file loaded")
-filename_label.pack(pady=0)
-
-# Frame for labels and combobox
-label_frame = tk.Frame(root)
-label_frame.pack(anchor='w')
-
-# Label for "Memory"
-memory_label = tk.Label(label_frame, text="Prev. Filters:")
-memory_label.pack(side='left', padx=5)
-
-# Create a dropdown for the last three checkbox states
-combobox = ttk.Combobox(label_frame, width=10, state='readonly')
-combobox.pack(side='left')
-
-# Horizontal line
-line = tk.Frame(root, height=1, bg='black')
-line.pack(fill='x', padx=5, pady=5)
-
-# Frame to contain the scrollable canvas and scrollbars
-frame = tk.Frame(root)
-frame.pack(fill='both', expand=True)
-
-# Canvas for the scrollable content
-canvas = tk.Canvas(frame)
-scrollbar_x = tk.Scrollbar(frame, orient='horizontal', command=canvas.xview)
-scrollbar_y = tk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-scrollable_frame = tk.Frame(canvas)
-
-scrollbar_x.pack(side='bottom', fill='x')
-scrollbar_y.pack(side='right', fill='y')
-canvas.pack(side='left', fill='both', expand=True)
-canvas.configure(xscrollcommand=scrollbar_x.set, yscrollcommand=scrollbar_y.set)
-canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-# Frame to contain the filter options
-filter_frame = tk.Frame(root)
-filter_frame.pack(side=tk.LEFT, padx=50, pady=0, fill='both', anchor='n')
-
-# Label and entry for filter text
-filter_label = tk.Label(filter_frame, text="Filter Text:")
-filter_label.pack(side=tk.TOP, fill='x', pady=(0, 0))
-filter_entry = tk.Entry(filter_frame)
-filter_entry.pack(side=tk.TOP, fill='x')
-
-# Checkbox to toggle 'filter out' mode
-filter_out_var = tk.BooleanVar()
-filter_out_checkbox = tk.Checkbutton(filter_frame, text="Filter out", variable=filter_out_var)
-filter_out_checkbox.pack(side=tk.TOP, fill='x')
-
-# Label and entry for the number of context lines
-lines_context_label = tk.Label(root, text="# Lines Before/After:")
-lines_context_label.pack(pady=0)
-lines_context_entry = tk.Entry(root)
-lines_context_entry.pack(pady=0)
-
-# Button to save the selected results
-save_button = tk.Button(root, text="Save & View", command=save_filtered_results)
-save_button.pack(pady=3)
-
-# Bind the function to the combobox
-bind_combobox()
-
-# Update the dropdown when the GUI starts
-update_combobox()
-
-# Dictionary to store the checkbox variables
-checkboxes = {}
-
-# Start the GUI event loop
-root.mainloop()
+if __name__ == '__main__':
+    # Keep worker processes of a frozen .exe build from starting the GUI again
+    multiprocessing.freeze_support()
+
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Ultimate FortiClient EMS Log Filter v.4")
+    root.geometry("450x650")
+
+    # Frame to contain the Load button and combobox
+    top_frame = tk.Frame(root)
+    top_frame.pack(pady=3)
+
+    # Button to load the log file
+    load_button = tk.Button(top_frame, text="Load Log File", command=load_file)
+    load_button.grid(row=0, column=0, padx=5)
+
+    # Label to display the loaded filename
+    filename_label = tk.Label(root, text="No file loaded")
+    filename_label.pack(pady=0)
+
+    # Frame for labels and combobox
+    label_frame = tk.Frame(root)
+    label_frame.pack(anchor='w')
+
+    # Label for "Memory"
+    memory_label = tk.Label(label_frame, text="Prev. Filters:")
+    memory_label.pack(side='left', padx=5)
+
+    # Create a dropdown for the last three checkbox states
+    combobox = ttk.Combobox(label_frame, width=10, state='readonly')
+    combobox.pack(side='left')
+
+    # Horizontal line
+    line = tk.Frame(root, height=1, bg='black')
+    line.pack(fill='x', padx=5, pady=5)
+
+    # Frame to contain the scrollable canvas and scrollbars
+    frame = tk.Frame(root)
+    frame.pack(fill='both', expand=True)
+
+    # Canvas for the scrollable content
+    canvas = tk.Canvas(frame)
+    scrollbar_x = tk.Scrollbar(frame, orient='horizontal', command=canvas.xview)
+    scrollbar_y = tk.Scrollbar(frame, orient='vertical', command=canvas.yview)
+    scrollable_frame = tk.Frame(canvas)
+
+    scrollbar_x.pack(side='bottom', fill='x')
+    scrollbar_y.pack(side='right', fill='y')
+    canvas.pack(side='left', fill='both', expand=True)
+    canvas.configure(xscrollcommand=scrollbar_x.set, yscrollcommand=scrollbar_y.set)
+    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+
+    # Frame to contain the filter options
+    filter_frame = tk.Frame(root)
+    filter_frame.pack(side=tk.LEFT, padx=50, pady=0, fill='both', anchor='n')
+
+    # Label and entry for filter text
+    filter_label = tk.Label(filter_frame, text="Filter Text:")
+    filter_label.pack(side=tk.TOP, fill='x', pady=(0, 0))
+    filter_entry = tk.Entry(filter_frame)
+    filter_entry.pack(side=tk.TOP, fill='x')
+
+    # Dropdown to match the filter text against one field's value instead of the whole entry
+    filter_field_label = tk.Label(filter_frame, text="Filter Field:")
+    filter_field_label.pack(side=tk.TOP, fill='x')
+    filter_field_combobox = ttk.Combobox(filter_frame, width=10, state='readonly', values=[ANY_FIELD])
+    filter_field_combobox.set(ANY_FIELD)
+    filter_field_combobox.pack(side=tk.TOP, fill='x')
+    filter_field_hint = tk.Label(filter_frame, text="A field needs the exact value;\n(any) finds the text anywhere", fg='gray', justify=tk.LEFT)
+    filter_field_hint.pack(side=tk.TOP, fill='x')
+
+    # Checkbox to toggle 'filter out' mode
+    filter_out_var = tk.BooleanVar()
+    filter_out_checkbox = tk.Checkbutton(filter_frame, text="Filter out", variable=filter_out_var)
+    filter_out_checkbox.pack(side=tk.TOP, fill='x')
+
+    # Label and entry for the number of context lines
+    lines_context_label = tk.Label(root, text="# Lines Before/After:")
+    lines_context_label.pack(pady=0)
+    lines_context_entry = tk.Entry(root)
+    lines_context_entry.pack(pady=0)
+
+    # Button to save the selected results
+    save_button = tk.Button(root, text="Save & View", command=save_filtered_results)
+    save_button.pack(pady=3)
+
+    # Bind the function to the combobox
+    bind_combobox()
+
+    # Update the dropdown when the GUI starts
+    update_combobox()
+
+    # Dictionary to store the checkbox variables
+    checkboxes = {}
+
+    # Checkbox widgets and their variables, kept across file loads
+    checkbutton_pool = []
+
+    # Start the GUI event loop
+    root.mainloop()